@@ -101,3 +101,16 @@ STATICFILES_FINDERS = (
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+BANK_INTEREST_ANNUAL_RATE = os.getenv("BANK_INTEREST_ANNUAL_RATE", "0.05")
+BANK_MONTHLY_FEE = os.getenv("BANK_MONTHLY_FEE", "5000.00")
+BANK_ACCRUAL_CHUNK_SIZE = int(os.getenv("BANK_ACCRUAL_CHUNK_SIZE", "1000"))
+
+BANK_WEBHOOK_URLS = [url for url in os.getenv("BANK_WEBHOOK_URLS", "").split(",") if url]
+BANK_OUTBOX_BATCH_SIZE = int(os.getenv("BANK_OUTBOX_BATCH_SIZE", "100"))
+BANK_OUTBOX_CONCURRENCY = int(os.getenv("BANK_OUTBOX_CONCURRENCY", "8"))
+BANK_OUTBOX_TIMEOUT_SECONDS = float(os.getenv("BANK_OUTBOX_TIMEOUT_SECONDS", "5"))
+BANK_OUTBOX_LEASE_SECONDS = int(os.getenv("BANK_OUTBOX_LEASE_SECONDS", "60"))
+BANK_OUTBOX_MAX_ATTEMPTS = int(os.getenv("BANK_OUTBOX_MAX_ATTEMPTS", "10"))
+BANK_OUTBOX_BACKOFF_SECONDS = int(os.getenv("BANK_OUTBOX_BACKOFF_SECONDS", "5"))
+BANK_OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv("BANK_OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+
@@ -0,0 +1,120 @@
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Account, AccrualRun, Transaction
+
+
+CENT = Decimal("0.01")
+DAYS_IN_YEAR = 365
+BANK_COUNTERPARTY = "Bank"
+
+
+def daily_interest(balance, annual_rate):
+    """Bir kunlik foiz: manfiy bo'lmagan balansga, banker rounding bilan tiyingacha."""
+    if balance <= 0:
+        return Decimal("0.00")
+    return (balance * annual_rate / DAYS_IN_YEAR).quantize(CENT, rounding=ROUND_HALF_EVEN)
+
+
+def monthly_fee(balance, fee):
+    """Oylik xizmat haqi balansdan oshmaydi, balans manfiyga tushmaydi."""
+    if balance <= 0:
+        return Decimal("0.00")
+    return min(balance, fee).quantize(CENT, rounding=ROUND_HALF_EVEN)
+
+
+def _run_batches(kind, period, compute, transaction_type, description, debit, chunk_size):
+    run, _ = AccrualRun.objects.get_or_create(kind=kind, period=period)
+    if run.completed_at is not None:
+        return run
+
+    # Har bir bo'lak bitta set-based UPDATE bilan yoziladi: Decimal da hisoblangan
+    # summalar VALUES ro'yxati sifatida yuboriladi va pk bo'yicha join qilinadi.
+    # (Case/When ORM tomonida juda qimmat, executemany esa qator-ba-qator ishlaydi.)
+    update_sql = (
+        "UPDATE {table} SET {balance} = {table}.{balance} {op} v.column2, {updated_at} = %s "
+        "FROM (VALUES {{values}}) AS v WHERE {table}.{pk} = v.column1"
+    ).format(
+        table=connection.ops.quote_name(Account._meta.db_table),
+        balance=connection.ops.quote_name("balance"),
+        updated_at=connection.ops.quote_name("updated_at"),
+        pk=connection.ops.quote_name(Account._meta.pk.column),
+        op="-" if debit else "+",
+    )
+    while True:
+        with transaction.atomic():
+            run = AccrualRun.objects.select_for_update().get(pk=run.pk)
+            rows = list(
+                Account.objects.select_for_update()
+                .filter(pk__gt=run.last_account_id)
+                .order_by("pk")
+                .values_list("pk", "user_id", "balance")[:chunk_size]
+            )
+            if not rows:
+                run.completed_at = timezone.now()
+                run.save(update_fields=["completed_at"])
+                return run
+
+            updates = []
+            ledger = []
+            for account_id, user_id, balance in rows:
+                amount = compute(balance)
+                if not amount:
+                    continue
+                updates.append((account_id, amount))
+                ledger.append(
+                    Transaction(
+                        user_id=user_id,
+                        account_id=account_id,
+                        amount=amount,
+                        transaction_type=transaction_type,
+                        description=description,
+                        counterparty=BANK_COUNTERPARTY,
+                    )
+                )
+                run.total_amount += amount
+
+            if updates:
+                params = [connection.ops.adapt_datetimefield_value(timezone.now())]
+                for account_id, amount in updates:
+                    params.extend((account_id, amount))
+                with connection.cursor() as cursor:
+                    cursor.execute(update_sql.format(values=", ".join(["(%s, %s)"] * len(updates))), params)
+                Transaction.objects.bulk_create(ledger)
+
+            run.last_account_id = rows[-1][0]
+            run.processed_count += len(rows)
+            run.save(update_fields=["last_account_id", "processed_count", "total_amount"])
+
+
+def accrue_daily_interest(run_date=None, annual_rate=None, chunk_size=None):
+    """Barcha hisoblarga kunlik foizni hisoblaydi; bir sana uchun faqat bir marta."""
+    run_date = run_date or timezone.localdate()
+    annual_rate = Decimal(annual_rate if annual_rate is not None else settings.BANK_INTEREST_ANNUAL_RATE)
+    return _run_batches(
+        kind=AccrualRun.Kind.INTEREST,
+        period=run_date,
+        compute=lambda balance: daily_interest(balance, annual_rate),
+        transaction_type=Transaction.TransactionType.INTEREST,
+        description=f"{run_date:%d.%m.%Y} uchun foiz",
+        debit=False,
+        chunk_size=chunk_size or settings.BANK_ACCRUAL_CHUNK_SIZE,
+    )
+
+
+def charge_monthly_fees(run_date=None, fee=None, chunk_size=None):
+    """Barcha hisoblardan oylik xizmat haqini yechadi; bir oy uchun faqat bir marta."""
+    period = (run_date or timezone.localdate()).replace(day=1)
+    fee = Decimal(fee if fee is not None else settings.BANK_MONTHLY_FEE)
+    return _run_batches(
+        kind=AccrualRun.Kind.MONTHLY_FEE,
+        period=period,
+        compute=lambda balance: monthly_fee(balance, fee),
+        transaction_type=Transaction.TransactionType.MONTHLY_FEE,
+        description=f"{period:%m.%Y} oylik xizmat haqi",
+        debit=True,
+        chunk_size=chunk_size or settings.BANK_ACCRUAL_CHUNK_SIZE,
+    )
@@ -1,6 +1,9 @@
 from django.contrib import admin
 
-from .models import Transaction
+from .models import Account, AccrualRun, OutboxEvent, Transaction
 
 
 admin.site.register(Transaction)
+admin.site.register(Account)
+admin.site.register(AccrualRun)
+admin.site.register(OutboxEvent)
@@ -3,8 +3,11 @@ from decimal import Decimal
 from django import forms
 from django.contrib.auth import authenticate, get_user_model
 from django.db import transaction
+from django.db.models import Case, F, Q, When
+from django.utils import timezone
 
-from .models import Transaction, UserProfile
+from . import outbox
+from .models import Account, Transaction, UserProfile, get_primary_account
 
 
 User = get_user_model()
@@ -113,6 +116,9 @@ class LoginForm(TailwindFormMixin, forms.Form):
 
 
 class TransferForm(TailwindFormMixin, forms.Form):
+    from_account = forms.ModelChoiceField(
+        queryset=Account.objects.none(), label="Hisobdan", required=False, empty_label=None
+    )
     recipient_email = forms.EmailField(label="Qabul qiluvchi emaili")
     amount = forms.DecimalField(max_digits=12, decimal_places=2, label="Miqdor")
     note = forms.CharField(label="Izoh", required=False, widget=forms.Textarea(attrs={"rows": 3}))
@@ -120,6 +126,11 @@ class TransferForm(TailwindFormMixin, forms.Form):
     def __init__(self, sender, *args, **kwargs):
         self.sender = sender
         super().__init__(*args, **kwargs)
+        self.fields["from_account"].queryset = sender.accounts.all()
+
+    def clean_from_account(self):
+        account = self.cleaned_data.get("from_account")
+        return account or get_primary_account(self.sender)
 
     def clean_amount(self):
         amount = self.cleaned_data["amount"]
@@ -140,45 +151,76 @@ class TransferForm(TailwindFormMixin, forms.Form):
     def clean(self):
         cleaned_data = super().clean()
         amount = cleaned_data.get("amount")
-        if amount is not None:
-            balance = self.sender.profile.balance
-            if amount > balance:
+        account = cleaned_data.get("from_account")
+        if amount is not None and account is not None:
+            if amount > account.balance:
                 raise forms.ValidationError("Balansda yetarli mablag' yo'q.")
         return cleaned_data
 
     def save(self):
+        """Mablag' yetarli bo'lmasa (parallel yechib olingan bo'lsa) hech narsa
+        o'zgarmaydi va ``None`` qaytadi.
+        """
         amount = self.cleaned_data["amount"]
         note = self.cleaned_data.get("note", "")
+        sender_account = self.cleaned_data["from_account"]
         with transaction.atomic():
-            sender_profile = self.sender.profile
-            recipient_profile = self.recipient.profile
-            sender_profile.balance -= amount
-            recipient_profile.balance += amount
-            sender_profile.save(update_fields=["balance"])
-            recipient_profile.save(update_fields=["balance"])
-            Transaction.objects.create(
+            now = timezone.now()
+            debited = Account.objects.filter(pk=sender_account.pk, balance__gte=amount).update(
+                balance=F("balance") - amount, updated_at=now
+            )
+            if not debited:
+                transaction.set_rollback(True)
+                return None
+            recipient_account = get_primary_account(self.recipient)
+            Account.objects.filter(pk=recipient_account.pk).update(balance=F("balance") + amount, updated_at=now)
+            outgoing = Transaction.objects.create(
                 user=self.sender,
+                account=sender_account,
                 amount=amount,
                 transaction_type=Transaction.TransactionType.TRANSFER_OUT,
                 description=note,
                 counterparty=self.recipient.get_full_name() or self.recipient.email,
                 performed_by=self.sender,
             )
-            Transaction.objects.create(
+            incoming = Transaction.objects.create(
                 user=self.recipient,
+                account=recipient_account,
                 amount=amount,
                 transaction_type=Transaction.TransactionType.TRANSFER_IN,
                 description=note,
                 counterparty=self.sender.get_full_name() or self.sender.email,
                 performed_by=self.sender,
             )
+            outbox.enqueue(
+                "transfer.completed",
+                {
+                    "amount": str(amount),
+                    "note": note,
+                    "sender": {"id": self.sender.pk, "email": self.sender.email, "account": sender_account.number},
+                    "recipient": {
+                        "id": self.recipient.pk,
+                        "email": self.recipient.email,
+                        "account": recipient_account.number,
+                    },
+                    "transactions": {"out": outgoing.pk, "in": incoming.pk},
+                },
+            )
         return amount
 
 
 class TopUpForm(TailwindFormMixin, forms.Form):
+    account = forms.ModelChoiceField(queryset=Account.objects.none(), label="Hisob", required=False, empty_label=None)
     amount = forms.DecimalField(max_digits=12, decimal_places=2, label="Miqdor")
     note = forms.CharField(label="Izoh", required=False)
 
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if user is None:
+            del self.fields["account"]
+        else:
+            self.fields["account"].queryset = user.accounts.all()
+
     def clean_amount(self):
         amount = self.cleaned_data["amount"]
         if amount <= 0:
@@ -188,18 +230,120 @@ class TopUpForm(TailwindFormMixin, forms.Form):
     def save(self, user, is_fake=False, performed_by=None):
         amount = self.cleaned_data["amount"]
         note = self.cleaned_data.get("note", "")
-        profile = user.profile
-        profile.balance += amount
-        profile.save(update_fields=["balance"])
-        Transaction.objects.create(
-            user=user,
-            amount=amount,
-            transaction_type=(
-                Transaction.TransactionType.FAKE_PAYMENT if is_fake else Transaction.TransactionType.TOP_UP
-            ),
-            description=note,
-            performed_by=performed_by,
-        )
+        with transaction.atomic():
+            account = self.cleaned_data.get("account") or get_primary_account(user)
+            Account.objects.filter(pk=account.pk).update(balance=F("balance") + amount, updated_at=timezone.now())
+            record = Transaction.objects.create(
+                user=user,
+                account=account,
+                amount=amount,
+                transaction_type=(
+                    Transaction.TransactionType.FAKE_PAYMENT if is_fake else Transaction.TransactionType.TOP_UP
+                ),
+                description=note,
+                performed_by=performed_by,
+            )
+            outbox.enqueue(
+                "top_up.completed",
+                {
+                    "amount": str(amount),
+                    "note": note,
+                    "user": {"id": user.pk, "email": user.email, "account": account.number},
+                    "transaction": record.pk,
+                    "transaction_type": record.transaction_type,
+                },
+            )
+        return amount
+
+
+class AccountForm(TailwindFormMixin, forms.ModelForm):
+    class Meta:
+        model = Account
+        fields = ["name"]
+        labels = {"name": "Hisob nomi"}
+
+    def save(self, user):
+        account = super().save(commit=False)
+        account.user = user
+        account.save()
+        return account
+
+
+class AccountTransferForm(TailwindFormMixin, forms.Form):
+    from_account = forms.ModelChoiceField(queryset=Account.objects.none(), label="Hisobdan", empty_label=None)
+    to_account = forms.ModelChoiceField(queryset=Account.objects.none(), label="Hisobga", empty_label=None)
+    amount = forms.DecimalField(max_digits=12, decimal_places=2, label="Miqdor")
+    note = forms.CharField(label="Izoh", required=False)
+
+    def __init__(self, user, *args, **kwargs):
+        self.user = user
+        super().__init__(*args, **kwargs)
+        accounts = user.accounts.all()
+        self.fields["from_account"].queryset = accounts
+        self.fields["to_account"].queryset = accounts
+
+    def clean_amount(self):
+        amount = self.cleaned_data["amount"]
+        if amount <= 0:
+            raise forms.ValidationError("Miqdor musbat bo'lishi kerak.")
+        return amount.quantize(Decimal("0.01"))
+
+    def clean(self):
+        cleaned_data = super().clean()
+        source = cleaned_data.get("from_account")
+        target = cleaned_data.get("to_account")
+        amount = cleaned_data.get("amount")
+        if source and target and source == target:
+            raise forms.ValidationError("Hisoblar har xil bo'lishi kerak.")
+        if source and amount is not None and amount > source.balance:
+            raise forms.ValidationError("Balansda yetarli mablag' yo'q.")
+        return cleaned_data
+
+    def save(self):
+        """O'z hisoblari orasida o'tkazma: ikkala balans bitta UPDATE bilan o'zgaradi.
+
+        Mablag' yetarli bo'lmasa (parallel yechib olingan bo'lsa) hech narsa
+        o'zgarmaydi va ``None`` qaytadi.
+        """
+        source = self.cleaned_data["from_account"]
+        target = self.cleaned_data["to_account"]
+        amount = self.cleaned_data["amount"]
+        note = self.cleaned_data.get("note", "")
+        with transaction.atomic():
+            moved = (
+                # Shart yangilanayotgan qatorning o'zida: Postgres qulfni kutgandan keyin
+                # balance__gte ni qayta tekshiradi, alohida EXISTS esa tekshirmaydi.
+                Account.objects.filter(Q(pk=target.pk) | Q(pk=source.pk, balance__gte=amount), user=self.user)
+                .update(
+                    balance=Case(When(pk=source.pk, then=F("balance") - amount), default=F("balance") + amount),
+                    updated_at=timezone.now(),
+                )
+            )
+            if moved != 2:
+                transaction.set_rollback(True)
+                return None
+            Transaction.objects.bulk_create(
+                [
+                    Transaction(
+                        user=self.user,
+                        account=source,
+                        amount=amount,
+                        transaction_type=Transaction.TransactionType.TRANSFER_OUT,
+                        description=note,
+                        counterparty=str(target),
+                        performed_by=self.user,
+                    ),
+                    Transaction(
+                        user=self.user,
+                        account=target,
+                        amount=amount,
+                        transaction_type=Transaction.TransactionType.TRANSFER_IN,
+                        description=note,
+                        counterparty=str(source),
+                        performed_by=self.user,
+                    ),
+                ]
+            )
         return amount
 
 
@@ -0,0 +1,173 @@
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+ENDPOINTS = ["register", "login", "dashboard", "transfer", "top_up"]
+
+
+def percentile(values, pct):
+    """Nearest-rank persentil; bo'sh ro'yxat uchun 0."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def redirected_to_dashboard(response):
+    return response.status_code == 302 and response.url == reverse("dashboard")
+
+
+def dashboard_rendered(response):
+    # Anonim mijoz ham 200 bilan home.html ni oladi, shuning uchun sessiya tekshiriladi.
+    return response.status_code == 200 and response.wsgi_request.user.is_authenticated
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def request(self, name, check, method, *args, **kwargs):
+        """So'rovni o'lchaydi; natija ``check`` orqali baholanadi, status kodning o'zi yetmaydi."""
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            try:
+                response = method(*args, **kwargs)
+                error = None if check(response) else f"unexpected_{response.status_code}"
+            except Exception as exc:
+                # Masalan SQLite dagi "database is locked" - xato sifatida hisoblanadi.
+                error = type(exc).__name__
+            elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples[name].append((elapsed, len(queries), error))
+        return error is None
+
+
+def _virtual_user(recorder, recipients, password, iterations, rng):
+    client = Client()
+    email = f"lt-{uuid.uuid4().hex[:12]}@load.test"
+    try:
+        registered = recorder.request(
+            "register",
+            redirected_to_dashboard,
+            client.post,
+            reverse("register"),
+            {"full_name": "Load Test", "email": email, "password1": password, "password2": password},
+        )
+        if not registered:
+            return
+        for _ in range(iterations):
+            client.cookies.clear()
+            logged_in = recorder.request(
+                "login",
+                redirected_to_dashboard,
+                client.post,
+                reverse("login"),
+                {"email": email, "password": password, "remember_me": "on"},
+            )
+            if not logged_in:
+                # Sessiyasiz keyingi so'rovlar login sahifasiga tez redirect bo'lib,
+                # kechikish statistikasini buzadi - iteratsiya o'tkazib yuboriladi.
+                continue
+            recorder.request("dashboard", dashboard_rendered, client.get, reverse("dashboard"))
+            recorder.request(
+                "top_up",
+                redirected_to_dashboard,
+                client.post,
+                reverse("top_up"),
+                {"amount": "1000.00", "note": "load"},
+            )
+            recorder.request(
+                "transfer",
+                redirected_to_dashboard,
+                client.post,
+                reverse("transfer"),
+                {"recipient_email": rng.choice(recipients), "amount": "10.00", "note": "load"},
+            )
+            recorder.request("dashboard", dashboard_rendered, client.get, reverse("dashboard"))
+    finally:
+        connection.close()
+
+
+def run(recipients, virtual_users=20, concurrency=8, iterations=5, password="LoadTest!2024", seed=None):
+    """Ro'yxatdan o'tish, login, dashboard, o'tkazma va to'ldirish oqimlarini parallel ishga tushiradi.
+
+    ``recipients`` - o'tkazmalar uchun mavjud foydalanuvchi emaillari.
+    """
+    recorder = Recorder()
+    rng = random.Random(seed)
+    seeds = [rng.random() for _ in range(virtual_users)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(_virtual_user, recorder, recipients, password, iterations, random.Random(user_seed))
+            for user_seed in seeds
+        ]
+        for future in futures:
+            future.result()
+    wall = time.perf_counter() - started
+    return report(recorder.samples, wall, virtual_users=virtual_users, concurrency=concurrency, iterations=iterations)
+
+
+def report(samples, wall, **meta):
+    endpoints = {}
+    for name in ENDPOINTS:
+        rows = samples.get(name, [])
+        # Kechikish faqat muvaffaqiyatli so'rovlar bo'yicha: tez qaytgan xatolar p50/p95 ni buzmasin.
+        latencies = [elapsed * 1000 for elapsed, _, error in rows if not error]
+        queries = [count for _, count, _ in rows]
+        errors = Counter(error for _, _, error in rows if error)
+        endpoints[name] = {
+            "requests": len(rows),
+            "errors": sum(errors.values()),
+            "error_kinds": dict(errors),
+            "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p90": round(percentile(latencies, 90), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "max": round(max(latencies, default=0), 2),
+            },
+            "queries": {
+                "mean": round(sum(queries) / len(queries), 2) if queries else 0.0,
+                "max": max(queries, default=0),
+            },
+        }
+    total = sum(len(rows) for rows in samples.values())
+    return {
+        "meta": {**meta, "wall_seconds": round(wall, 3), "total_requests": total},
+        "endpoints": endpoints,
+    }
+
+
+def compare(current, baseline):
+    """Har bir endpoint uchun p95 kechikish va o'rtacha so'rovlar sonining o'zgarishi."""
+    diff = {}
+    for name, stats in current["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if not previous:
+            continue
+        diff[name] = {
+            "p95_ms": round(stats["latency_ms"]["p95"] - previous["latency_ms"]["p95"], 2),
+            "queries_mean": round(stats["queries"]["mean"] - previous["queries"]["mean"], 2),
+            "throughput_rps": round(stats["throughput_rps"] - previous["throughput_rps"], 2),
+        }
+    return diff
+
+
+def save(result, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(result, fh, indent=2, ensure_ascii=False)
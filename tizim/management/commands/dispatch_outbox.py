@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tizim.outbox import dispatch_batch
+
+
+class Command(BaseCommand):
+    help = "Outbox hodisalarini webhook manzillariga yuboradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="To'xtovsiz ishlash (worker rejimi).")
+        parser.add_argument("--interval", type=float, default=1.0, help="Navbat bo'sh bo'lganda kutish (soniya).")
+        parser.add_argument("--batch-size", type=int, help="Bir martada olinadigan hodisalar soni.")
+        parser.add_argument("--concurrency", type=int, help="Bir vaqtda yuboriladigan so'rovlar soni.")
+
+    def handle(self, *args, **options):
+        while True:
+            delivered = dispatch_batch(batch_size=options["batch_size"], concurrency=options["concurrency"])
+            if delivered:
+                self.stdout.write(f"{delivered} ta hodisa yetkazildi.")
+            if not options["loop"]:
+                return
+            if not delivered:
+                time.sleep(options["interval"])
@@ -0,0 +1,135 @@
+import random
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tizim.models import Account, Transaction, UserProfile, assign_account_numbers
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Yuklama testlari uchun sintetik foydalanuvchi, profil va tranzaksiyalar yaratadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Yaratiladigan foydalanuvchilar soni.")
+        parser.add_argument("--transactions", type=int, default=10000, help="O'tkazmalar soni (har biri 2 yozuv).")
+        parser.add_argument("--heavy-share", type=float, default=0.1, help="Faol foydalanuvchilar ulushi (0..1).")
+        parser.add_argument(
+            "--heavy-weight", type=float, default=0.8, help="O'tkazmalarning faol foydalanuvchilarga tushadigan ulushi."
+        )
+        parser.add_argument(
+            "--extra-accounts", type=int, default=2, help="Faol foydalanuvchilarga qo'shimcha ochiladigan hisoblar soni."
+        )
+        parser.add_argument("--prefix", default="load", help="Email prefiksi: <prefix><n>@load.test")
+        parser.add_argument("--password", default="parol12345", help="Barcha foydalanuvchilar uchun parol.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def _next_suffix(self, prefix):
+        # Soni emas, eng katta mavjud raqamdan davom etamiz: o'chirilgan yoki
+        # boshqa prefiksli foydalanuvchilar to'qnashuvga olib kelmaydi.
+        usernames = User.objects.filter(username__startswith=prefix, username__endswith="@load.test").values_list(
+            "username", flat=True
+        )
+        suffixes = (username[len(prefix) : -len("@load.test")] for username in usernames.iterator())
+        return max((int(suffix) + 1 for suffix in suffixes if suffix.isdigit()), default=0)
+
+    def handle(self, *args, **options):
+        users_count = options["users"]
+        if users_count < 2:
+            raise CommandError("Kamida 2 ta foydalanuvchi kerak.")
+        if not 0 < options["heavy_share"] <= 1 or not 0 <= options["heavy_weight"] <= 1:
+            raise CommandError("--heavy-share (0..1] va --heavy-weight [0..1] oralig'ida bo'lishi kerak.")
+
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        prefix = options["prefix"]
+        password = make_password(options["password"])
+        start = self._next_suffix(prefix)
+
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [
+                    User(
+                        username=f"{prefix}{n}@load.test",
+                        email=f"{prefix}{n}@load.test",
+                        first_name="Load",
+                        last_name=str(n),
+                        password=password,
+                    )
+                    for n in range(start, start + users_count)
+                ],
+                batch_size=batch_size,
+            )
+            balances = {user.pk: Decimal(rng.randrange(100_000, 10_000_000)) for user in users}
+            ledger = [
+                Transaction(
+                    user_id=user.pk,
+                    amount=balances[user.pk],
+                    transaction_type=Transaction.TransactionType.TOP_UP,
+                    description="Boshlang'ich balans",
+                    performed_by_id=user.pk,
+                )
+                for user in users
+            ]
+
+            heavy_count = max(1, int(users_count * options["heavy_share"]))
+            heavy, light = users[:heavy_count], users[heavy_count:] or users[:heavy_count]
+            for _ in range(options["transactions"]):
+                pool = heavy if rng.random() < options["heavy_weight"] else light
+                sender = rng.choice(pool)
+                recipient = rng.choice(users)
+                if recipient.pk == sender.pk:
+                    continue
+                amount = Decimal(rng.randrange(100, 50_000_00)) / 100
+                if amount > balances[sender.pk]:
+                    continue
+                balances[sender.pk] -= amount
+                balances[recipient.pk] += amount
+                ledger.append(
+                    Transaction(
+                        user_id=sender.pk,
+                        amount=amount,
+                        transaction_type=Transaction.TransactionType.TRANSFER_OUT,
+                        counterparty=recipient.email,
+                        performed_by_id=sender.pk,
+                    )
+                )
+                ledger.append(
+                    Transaction(
+                        user_id=recipient.pk,
+                        amount=amount,
+                        transaction_type=Transaction.TransactionType.TRANSFER_IN,
+                        counterparty=sender.email,
+                        performed_by_id=sender.pk,
+                    )
+                )
+
+            UserProfile.objects.bulk_create([UserProfile(user_id=user.pk) for user in users], batch_size=batch_size)
+            primary = Account.objects.bulk_create(
+                [Account(user_id=user_id, balance=balance, is_primary=True) for user_id, balance in balances.items()],
+                batch_size=batch_size,
+            )
+            extra = Account.objects.bulk_create(
+                [
+                    Account(user_id=user.pk, name=f"Biznes hisob {n + 1}")
+                    for user in heavy
+                    for n in range(options["extra_accounts"])
+                ],
+                batch_size=batch_size,
+            )
+            created = primary + extra
+            assign_account_numbers(Account.objects.filter(pk__gte=created[0].pk, pk__lte=created[-1].pk))
+            primary_ids = {account.user_id: account.pk for account in primary}
+            for txn in ledger:
+                txn.account_id = primary_ids[txn.user_id]
+            Transaction.objects.bulk_create(ledger, batch_size=batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(users)} foydalanuvchi va {len(ledger)} tranzaksiya yaratildi (prefiks: {prefix}).")
+        )
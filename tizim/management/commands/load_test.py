@@ -0,0 +1,63 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tizim import loadtest
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Asosiy oqimlar bo'yicha yuklama testi: throughput, kechikish persentillari va so'rovlar soni. "
+        "Ma'lumotlar bazasiga yozadi - faqat test bazasida ishlating. SQLite bir vaqtda faqat bitta "
+        "yozuvchini qo'llaydi: --concurrency > 1 da 'database is locked' xatolari ko'p bo'ladi, ular "
+        "error_kinds da OperationalError sifatida hisoblanadi; haqiqiy parallel o'lchov uchun PostgreSQL ishlating."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--virtual-users", type=int, default=20)
+        parser.add_argument(
+            "--concurrency", type=int, default=8, help="Parallel virtual foydalanuvchilar (SQLite da 1 tavsiya etiladi)."
+        )
+        parser.add_argument("--iterations", type=int, default=5, help="Har bir virtual foydalanuvchi sikllari.")
+        parser.add_argument("--recipients-prefix", default="load", help="generate_data bilan yaratilgan prefiks.")
+        parser.add_argument("--output", default="loadtest.json", help="Natijalar yoziladigan JSON fayl.")
+        parser.add_argument("--baseline", help="Solishtirish uchun oldingi natijalar JSON fayli.")
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        recipients = list(
+            User.objects.filter(email__startswith=options["recipients_prefix"]).values_list("email", flat=True)[:1000]
+        )
+        if not recipients:
+            raise CommandError("Qabul qiluvchilar topilmadi - avval generate_data ni ishga tushiring.")
+
+        result = loadtest.run(
+            recipients,
+            virtual_users=options["virtual_users"],
+            concurrency=options["concurrency"],
+            iterations=options["iterations"],
+            seed=options["seed"],
+        )
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                result["comparison"] = loadtest.compare(result, json.load(fh))
+        loadtest.save(result, options["output"])
+
+        for name, stats in result["endpoints"].items():
+            latency = stats["latency_ms"]
+            line = (
+                f"{name:<10} {stats['requests']:>6} req  {stats['errors']:>4} err  {stats['throughput_rps']:>8} rps  "
+                f"p50 {latency['p50']:>8} ms  p95 {latency['p95']:>8} ms  p99 {latency['p99']:>8} ms  "
+                f"{stats['queries']['mean']:>6} q/req"
+            )
+            if stats["error_kinds"]:
+                line += "  [" + ", ".join(f"{kind}: {count}" for kind, count in stats["error_kinds"].items()) + "]"
+            delta = result.get("comparison", {}).get(name)
+            if delta:
+                line += f"  (p95 {delta['p95_ms']:+} ms, {delta['queries_mean']:+} q)"
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f"Natijalar: {options['output']}"))
@@ -0,0 +1,42 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tizim.accruals import accrue_daily_interest, charge_monthly_fees
+
+
+class Command(BaseCommand):
+    help = "Kun yakunida foiz hisoblash va oylik xizmat haqini yechish (bo'laklab, checkpoint bilan)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Hisob sanasi (YYYY-MM-DD), standart: bugun.")
+        parser.add_argument("--interest", action="store_true", help="Kunlik foizni hisoblash.")
+        parser.add_argument("--fees", action="store_true", help="Oylik xizmat haqini yechish.")
+        parser.add_argument("--chunk-size", type=int, help="Bir tranzaksiyada qayta ishlanadigan hisoblar soni.")
+
+    def handle(self, *args, **options):
+        run_date = None
+        if options["date"]:
+            try:
+                run_date = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("Sana YYYY-MM-DD formatida bo'lishi kerak.")
+        jobs = []
+        if options["interest"]:
+            jobs.append(accrue_daily_interest)
+        if options["fees"]:
+            jobs.append(charge_monthly_fees)
+        if not jobs:
+            raise CommandError("--interest yoki --fees dan kamida bittasini tanlang.")
+
+        for job in jobs:
+            started = time.perf_counter()
+            run = job(run_date=run_date, chunk_size=options["chunk_size"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{run.get_kind_display()} ({run.period}): {run.processed_count} hisob, "
+                    f"jami {run.total_amount} so'm, {elapsed:.2f} s"
+                )
+            )
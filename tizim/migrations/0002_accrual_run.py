@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tizim', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccrualRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('interest', 'Kunlik foiz'), ('monthly_fee', 'Oylik xizmat haqi')], max_length=32)),
+                ('period', models.DateField()),
+                ('last_profile_id', models.BigIntegerField(default=0)),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('transfer_out', "Pul o'tkazish (chiqish)"), ('transfer_in', "Pul o'tkazish (kirish)"), ('top_up', "Kartani to'ldirish"), ('admin_adjustment', "Admin o'zgartirish"), ('fake_payment', "Fake to'lov"), ('interest', 'Foiz hisoblash'), ('monthly_fee', 'Oylik xizmat haqi')], max_length=32),
+        ),
+        migrations.AddConstraint(
+            model_name='accrualrun',
+            constraint=models.UniqueConstraint(fields=('kind', 'period'), name='unique_accrual_run_per_period'),
+        ),
+    ]
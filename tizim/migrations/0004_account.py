@@ -0,0 +1,131 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:34
+
+import django.db.models.deletion
+import tizim.models
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import OuterRef, Subquery
+
+
+BATCH_SIZE = 5000
+
+
+def attach_ledger(Account, Transaction):
+    primary_account = Account.objects.filter(user_id=OuterRef("user_id"), is_primary=True).values("pk")[:1]
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                Transaction.objects.filter(pk__gt=last_id, account__isnull=True)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:BATCH_SIZE]
+            )
+            if not ids:
+                break
+            Transaction.objects.filter(pk__in=ids).update(account_id=Subquery(primary_account))
+            last_id = ids[-1]
+
+
+def move_balances(apps, schema_editor):
+    # Qisqa, idempotent bo'laklar: uzoq qulflarsiz ishlaydi va qayta ishga
+    # tushirilsa allaqachon ko'chirilgan yozuvlarga tegmaydi. Ko'chirilgan
+    # qiymat migrated_balance ga yoziladi - 0005 shu nuqtadan keyin eski kod
+    # UserProfile.balance ga kiritgan o'zgarishlarni hisobga qo'shadi.
+    UserProfile = apps.get_model("tizim", "UserProfile")
+    Account = apps.get_model("tizim", "Account")
+    Transaction = apps.get_model("tizim", "Transaction")
+
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            profiles = list(
+                UserProfile.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", "user_id", "balance")[
+                    :BATCH_SIZE
+                ]
+            )
+            if not profiles:
+                break
+            migrated = set(
+                Account.objects.filter(user_id__in=[user_id for _, user_id, _ in profiles], is_primary=True).values_list(
+                    "user_id", flat=True
+                )
+            )
+            created = Account.objects.bulk_create(
+                [
+                    Account(user_id=user_id, balance=balance, migrated_balance=balance, is_primary=True)
+                    for _, user_id, balance in profiles
+                    if user_id not in migrated
+                ]
+            )
+            if created:
+                tizim.models.assign_account_numbers(Account.objects.filter(pk__in=[account.pk for account in created]))
+            last_id = profiles[-1][0]
+
+    attach_ledger(Account, Transaction)
+
+
+def restore_balances(apps, schema_editor):
+    UserProfile = apps.get_model("tizim", "UserProfile")
+    Account = apps.get_model("tizim", "Account")
+    for user_id, balance in Account.objects.filter(is_primary=True).values_list("user_id", "balance").iterator():
+        UserProfile.objects.filter(user_id=user_id).update(balance=balance)
+
+
+class Migration(migrations.Migration):
+    """Expand bosqichi: eski va yangi kod ikkalasi ham shu sxemada ishlay oladi.
+
+    UserProfile.balance DB default bilan qoladi (yangi kod uni yozmaydi).
+    AccrualRun checkpoint ustuni shu yerda last_account_id ga o'zgaradi, shuning
+    uchun 0004 dan yangi kod deploy qilingunga qadar run_accruals ishga tushirilmaydi.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('tizim', '0003_outbox_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Account',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(default='Asosiy hisob', max_length=100)),
+                ('number', models.CharField(blank=True, editable=False, max_length=16, null=True, unique=True)),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('migrated_balance', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('is_primary', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='accounts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-is_primary', 'created_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='account',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('user',), name='unique_primary_account_per_user'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='account',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='ledger', to='tizim.account'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', '-created_at'], name='transaction_account_ledger_idx'),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='balance',
+            field=models.DecimalField(db_default=0, decimal_places=2, default=0, max_digits=12),
+        ),
+        migrations.RenameField(
+            model_name='accrualrun',
+            old_name='last_profile_id',
+            new_name='last_account_id',
+        ),
+        migrations.RunPython(move_balances, restore_balances),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:34
+
+import importlib
+from decimal import Decimal
+
+import tizim.models
+from django.db import migrations, transaction
+from django.db.models import F
+
+
+BATCH_SIZE = 5000
+
+attach_ledger = importlib.import_module("tizim.migrations.0004_account").attach_ledger
+
+
+def reconcile_balances(apps, schema_editor):
+    # 0004 dan keyin eski kod faqat UserProfile.balance ga yozgan bo'lishi mumkin:
+    # ko'chirilgan qiymatdan keyingi farq asosiy hisobga qo'shiladi. Eski kod
+    # yaratgan (hisobsiz) foydalanuvchilarga asosiy hisob ochiladi.
+    UserProfile = apps.get_model("tizim", "UserProfile")
+    Account = apps.get_model("tizim", "Account")
+    Transaction = apps.get_model("tizim", "Transaction")
+
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            profiles = list(
+                UserProfile.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", "user_id", "balance")[
+                    :BATCH_SIZE
+                ]
+            )
+            if not profiles:
+                break
+            user_ids = [user_id for _, user_id, _ in profiles]
+            Account.objects.bulk_create(
+                [Account(user_id=user_id, is_primary=True) for user_id in user_ids], ignore_conflicts=True
+            )
+            primary = Account.objects.filter(user_id__in=user_ids, is_primary=True)
+            tizim.models.assign_account_numbers(primary)
+            accounts = {
+                user_id: (account_id, migrated)
+                for user_id, account_id, migrated in primary.values_list("user_id", "pk", "migrated_balance")
+            }
+            for _, user_id, balance in profiles:
+                account_id, migrated = accounts[user_id]
+                drift = (balance or Decimal("0")) - (migrated or Decimal("0"))
+                if drift:
+                    Account.objects.filter(pk=account_id).update(balance=F("balance") + drift, migrated_balance=balance)
+            last_id = profiles[-1][0]
+
+    attach_ledger(Account, Transaction)
+
+
+class Migration(migrations.Migration):
+    """Contract bosqichi: yangi kod to'liq ishga tushgandan keyin qo'llanadi."""
+
+    atomic = False
+
+    dependencies = [
+        ('tizim', '0004_account'),
+    ]
+
+    operations = [
+        migrations.RunPython(reconcile_balances, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='account',
+            name='migrated_balance',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='balance',
+        ),
+    ]
@@ -1,7 +1,10 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Cast, Concat, LPad
 from django.db.models.signals import post_save
+from django.utils import timezone
 
 
 User = get_user_model()
@@ -9,7 +12,6 @@ User = get_user_model()
 
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="profile")
-    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     profile_image = models.ImageField(upload_to="profiles/", blank=True, null=True)
     face_reference = models.ImageField(upload_to="faces/", blank=True, null=True)
     is_face_verified = models.BooleanField(default=False)
@@ -20,6 +22,58 @@ class UserProfile(models.Model):
         return f"{self.user.get_full_name() or self.user.username} profile"
 
 
+ACCOUNT_NUMBER_PREFIX = "8600"
+
+
+def account_number(pk):
+    """Hisob raqami pk dan olinadi (8600 + 12 xonali pk), shuning uchun takrorlanmaydi."""
+    return f"{ACCOUNT_NUMBER_PREFIX}{pk:012d}"
+
+
+def assign_account_numbers(queryset):
+    """``bulk_create`` dan keyin raqamsiz hisoblarga bitta UPDATE bilan raqam beradi."""
+    number = Concat(
+        Value(ACCOUNT_NUMBER_PREFIX),
+        LPad(Cast("pk", models.CharField()), 12, Value("0")),
+        output_field=models.CharField(),
+    )
+    return queryset.filter(number__isnull=True).update(number=number)
+
+
+class Account(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="accounts")
+    name = models.CharField(max_length=100, default="Asosiy hisob")
+    number = models.CharField(max_length=16, unique=True, null=True, blank=True, editable=False)
+    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    is_primary = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-is_primary", "created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user"], condition=models.Q(is_primary=True), name="unique_primary_account_per_user"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} (*{(self.number or '')[-4:]})"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if self.number is None:
+            self.number = account_number(self.pk)
+            type(self).objects.filter(pk=self.pk).update(number=self.number)
+
+
+def get_primary_account(user):
+    """Foydalanuvchining asosiy hisobi; migratsiya oynasida eski kod yaratgan
+    foydalanuvchilarda u bo'lmasligi mumkin, shuning uchun kerak bo'lsa ochiladi."""
+    account, _ = Account.objects.get_or_create(user=user, is_primary=True)
+    return account
+
+
 class Transaction(models.Model):
     class TransactionType(models.TextChoices):
         TRANSFER_OUT = ("transfer_out", "Pul o'tkazish (chiqish)")
@@ -27,8 +81,13 @@ class Transaction(models.Model):
         TOP_UP = ("top_up", "Kartani to'ldirish")
         ADMIN_ADJUSTMENT = ("admin_adjustment", "Admin o'zgartirish")
         FAKE_PAYMENT = ("fake_payment", "Fake to'lov")
+        INTEREST = ("interest", "Foiz hisoblash")
+        MONTHLY_FEE = ("monthly_fee", "Oylik xizmat haqi")
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="transactions")
+    account = models.ForeignKey(
+        Account, on_delete=models.CASCADE, related_name="ledger", null=True, blank=True, db_index=False
+    )
     amount = models.DecimalField(max_digits=12, decimal_places=2)
     transaction_type = models.CharField(max_length=32, choices=TransactionType.choices)
     description = models.CharField(max_length=255, blank=True)
@@ -44,14 +103,69 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["account", "-created_at"], name="transaction_account_ledger_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.transaction_type} - {self.amount}"
 
 
+class AccrualRun(models.Model):
+    """Batch hisoblash ishining checkpointi: to'xtab qolgan ish shu joydan davom etadi."""
+
+    class Kind(models.TextChoices):
+        INTEREST = ("interest", "Kunlik foiz")
+        MONTHLY_FEE = ("monthly_fee", "Oylik xizmat haqi")
+
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    period = models.DateField()
+    last_account_id = models.BigIntegerField(default=0)
+    processed_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "period"], name="unique_accrual_run_per_period"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} - {self.period}"
+
+
+class OutboxEvent(models.Model):
+    """Tashqi tizimlarga yuboriladigan hodisa; ledger bilan bitta tranzaksiyada yoziladi."""
+
+    class Status(models.TextChoices):
+        PENDING = ("pending", "Kutilmoqda")
+        DELIVERED = ("delivered", "Yetkazildi")
+        FAILED = ("failed", "Muvaffaqiyatsiz")
+
+    event_type = models.CharField(max_length=64)
+    endpoint = models.URLField(max_length=500)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_due_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} -> {self.endpoint} ({self.status})"
+
+
 def _create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
+        Account.objects.create(user=instance, is_primary=True)
 
 
 post_save.connect(_create_user_profile, sender=settings.AUTH_USER_MODEL)
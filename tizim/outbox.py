@@ -0,0 +1,115 @@
+import json
+import math
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+
+def enqueue(event_type, payload):
+    """Hodisani har bir webhook manzili uchun outboxga yozadi.
+
+    Chaqiruvchining ``transaction.atomic()`` bloki ichida ishlatiladi: ledger
+    yozuvlari saqlanmasa, hodisa ham saqlanmaydi.
+    """
+    events = [
+        OutboxEvent(event_type=event_type, endpoint=endpoint, payload=payload)
+        for endpoint in settings.BANK_WEBHOOK_URLS
+    ]
+    return OutboxEvent.objects.bulk_create(events)
+
+
+def _backoff(attempts):
+    delay = settings.BANK_OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1))
+    return timedelta(seconds=min(delay, settings.BANK_OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def _lease_seconds(batch_size, concurrency):
+    # Lease butun batch yuborilishidan uzoqroq bo'lishi kerak, aks holda boshqa
+    # ishchi hali yuborilayotgan hodisalarni qayta oladi. Har bir so'rov ulanish
+    # va javobni o'qish uchun ikki martagacha timeout kutishi mumkin.
+    rounds = math.ceil(batch_size / concurrency)
+    worst_case = rounds * 2 * settings.BANK_OUTBOX_TIMEOUT_SECONDS
+    return max(settings.BANK_OUTBOX_LEASE_SECONDS, math.ceil(worst_case * 1.5))
+
+
+def _claim(batch_size, concurrency):
+    # Olingan hodisalar lease muddatiga yashiriladi: ishchi yiqilsa, muddat tugagach
+    # ular qayta yuboriladi (at-least-once). Natijalar faqat lease hali shu
+    # ishchida bo'lsa yoziladi (next_attempt_at == lease_until).
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=_lease_seconds(batch_size, concurrency))
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEvent.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "pk")[:batch_size]
+        )
+        if events:
+            OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(next_attempt_at=lease_until)
+    return events, lease_until
+
+
+def _deliver(event):
+    body = json.dumps(
+        {"id": event.pk, "type": event.event_type, "created_at": event.created_at.isoformat(), "data": event.payload}
+    ).encode()
+    try:
+        request = urllib.request.Request(
+            event.endpoint,
+            data=body,
+            method="POST",
+            headers={
+                "Content-Type": "application/json",
+                "X-Outbox-Event-Id": str(event.pk),
+                "X-Outbox-Event-Type": event.event_type,
+            },
+        )
+        with urllib.request.urlopen(request, timeout=settings.BANK_OUTBOX_TIMEOUT_SECONDS) as response:
+            response.read()
+    except urllib.error.HTTPError as exc:
+        return f"HTTP {exc.code}"
+    except urllib.error.URLError as exc:
+        return str(exc.reason)
+    except Exception as exc:
+        # Bitta buzuq hodisa (noto'g'ri manzil, uzilgan javob) butun batchni
+        # to'xtatmasligi kerak: xato yoziladi va odatdagidek qayta uriniladi.
+        return f"{type(exc).__name__}: {exc}"
+    return None
+
+
+def dispatch_batch(batch_size=None, concurrency=None):
+    """Navbatdagi hodisalarni parallel yuboradi; yuborilganlar sonini qaytaradi."""
+    batch_size = batch_size or settings.BANK_OUTBOX_BATCH_SIZE
+    concurrency = concurrency or settings.BANK_OUTBOX_CONCURRENCY
+    events, lease_until = _claim(batch_size, concurrency)
+    if not events:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        errors = list(pool.map(_deliver, events))
+
+    now = timezone.now()
+    held = OutboxEvent.objects.filter(status=OutboxEvent.Status.PENDING, next_attempt_at=lease_until)
+    delivered = 0
+    ok = [event.pk for event, error in zip(events, errors) if error is None]
+    if ok:
+        delivered = held.filter(pk__in=ok).update(
+            status=OutboxEvent.Status.DELIVERED, delivered_at=now, last_error=""
+        )
+    for event, error in zip(events, errors):
+        if error is None:
+            continue
+        attempts = event.attempts + 1
+        if attempts >= settings.BANK_OUTBOX_MAX_ATTEMPTS:
+            changes = {"status": OutboxEvent.Status.FAILED}
+        else:
+            changes = {"next_attempt_at": now + _backoff(attempts)}
+        held.filter(pk=event.pk).update(attempts=attempts, last_error=error, **changes)
+    return delivered
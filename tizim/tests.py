@@ -1,3 +1,630 @@
-from django.test import TestCase
+import io
+import json
+import os
+import threading
+import time
+from datetime import date
+from decimal import ROUND_HALF_EVEN, Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import OperationalError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .accruals import accrue_daily_interest, charge_monthly_fees, daily_interest
+from . import loadtest, outbox
+from .forms import AccountTransferForm, TopUpForm, TransferForm
+from .models import Account, AccrualRun, OutboxEvent, Transaction, UserProfile, account_number
+from .outbox import dispatch_batch
+
+
+User = get_user_model()
+
+
+def _make_accounts(balances):
+    users = User.objects.bulk_create(
+        [User(username=f"user{i}@bank.uz", email=f"user{i}@bank.uz") for i in range(len(balances))]
+    )
+    Account.objects.bulk_create(
+        [Account(user=user, balance=Decimal(balance), is_primary=True) for user, balance in zip(users, balances)]
+    )
+
+
+def _reference(annual_rate=None, fee=None):
+    """Sekin, mustaqil variant: har bir hisob alohida hisoblanib save() qilinadi.
+
+    Natijaviy balanslar eslab qolinadi, o'zgarishlar esa bekor qilinadi, shunda
+    batch job aynan shu ma'lumotlar ustida ishga tushiriladi.
+    """
+    with transaction.atomic():
+        for account in Account.objects.order_by("pk"):
+            if account.balance <= 0:
+                continue
+            if annual_rate is not None:
+                interest = account.balance * Decimal(annual_rate) / 365
+                account.balance += interest.quantize(Decimal("0.01"), rounding=ROUND_HALF_EVEN)
+            else:
+                account.balance -= min(account.balance, Decimal(fee))
+            account.save()
+        expected = dict(Account.objects.values_list("pk", "balance"))
+        transaction.set_rollback(True)
+    return expected
+
+
+class AccrualTests(TestCase):
+    balances = ["0", "-15.00", "0.01", "100.00", "7300.00", "36.50", "1234567.89", "4999.99", "5000.00", "73.00"]
+
+    def setUp(self):
+        _make_accounts(self.balances)
+
+    def test_interest_matches_reference(self):
+        rate = Decimal("0.05")
+        expected = _reference(annual_rate=rate)
+
+        run = accrue_daily_interest(run_date=date(2026, 1, 15), annual_rate=rate, chunk_size=3)
+
+        self.assertIsNotNone(run.completed_at)
+        self.assertEqual(run.processed_count, len(self.balances))
+        self.assertEqual(dict(Account.objects.values_list("pk", "balance")), expected)
+        credited = Transaction.objects.filter(transaction_type=Transaction.TransactionType.INTEREST)
+        self.assertEqual(sum(credited.values_list("amount", flat=True)), run.total_amount)
+        self.assertFalse(credited.filter(amount__lte=0).exists())
+
+    def test_interest_uses_bankers_rounding(self):
+        # 36.50 * 0.05 / 365 = 0.005 -> 0.00, 73.00 * 0.05 / 365 = 0.01
+        self.assertEqual(daily_interest(Decimal("36.50"), Decimal("0.05")), Decimal("0.00"))
+        self.assertEqual(daily_interest(Decimal("109.50"), Decimal("0.05")), Decimal("0.02"))
+        self.assertEqual(daily_interest(Decimal("-100.00"), Decimal("0.05")), Decimal("0.00"))
+
+    def test_half_even_amounts_round_trip_through_batch_job(self):
+        # balance * 0.05 / 365 aniq yarim tiyinga tushadi: 0.005, 0.015, 0.025, 0.035
+        cases = {"36.50": "0.00", "109.50": "0.02", "182.50": "0.02", "255.50": "0.04"}
+        Account.objects.update(balance=0)
+        accounts = {}
+        for opening in cases:
+            user = User.objects.create(username=f"half-{opening}@bank.uz")
+            accounts[opening] = Account.objects.create(user=user, balance=Decimal(opening), name="Yarim")
+
+        accrue_daily_interest(run_date=date(2026, 1, 16), annual_rate="0.05", chunk_size=2)
+
+        for opening, credited in cases.items():
+            account = Account.objects.get(pk=accounts[opening].pk)
+            self.assertEqual(account.balance, Decimal(opening) + Decimal(credited))
+            expected_ledger = [Decimal(credited)] if Decimal(credited) else []
+            self.assertEqual(list(account.ledger.values_list("amount", flat=True)), expected_ledger)
+
+    def test_fees_match_reference_and_never_overdraw(self):
+        fee = Decimal("5000.00")
+        expected = _reference(fee=fee)
+
+        charge_monthly_fees(run_date=date(2026, 1, 31), fee=fee, chunk_size=4)
+
+        self.assertEqual(dict(Account.objects.values_list("pk", "balance")), expected)
+        self.assertFalse(Account.objects.filter(balance__lt=0).exclude(balance=Decimal("-15.00")).exists())
+
+    def test_run_is_idempotent_per_period(self):
+        accrue_daily_interest(run_date=date(2026, 1, 15), annual_rate="0.05")
+        balances = dict(Account.objects.values_list("pk", "balance"))
+        interest_count = Transaction.objects.count()
+
+        accrue_daily_interest(run_date=date(2026, 1, 15), annual_rate="0.05")
+
+        self.assertEqual(Transaction.objects.count(), interest_count)
+        self.assertEqual(dict(Account.objects.values_list("pk", "balance")), balances)
+
+        payers = Account.objects.filter(balance__gt=0).count()
+        charge_monthly_fees(run_date=date(2026, 1, 1), fee="10")
+        charge_monthly_fees(run_date=date(2026, 1, 20), fee="10")
+
+        fees = Transaction.objects.filter(transaction_type=Transaction.TransactionType.MONTHLY_FEE)
+        self.assertEqual(fees.count(), payers)
+        self.assertEqual(AccrualRun.objects.filter(kind=AccrualRun.Kind.MONTHLY_FEE).count(), 1)
+
+
+class AccrualResumeTests(TransactionTestCase):
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        _make_accounts([str(100 * i) for i in range(1, 11)])
+        rate = Decimal("0.10")
+        expected = _reference(annual_rate=rate)
+        bulk_create = Transaction.objects.bulk_create
+        calls = []
+
+        def flaky_bulk_create(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 3:
+                raise RuntimeError("worker killed")
+            return bulk_create(objs, *args, **kwargs)
+
+        with mock.patch.object(Transaction.objects, "bulk_create", side_effect=flaky_bulk_create):
+            with self.assertRaises(RuntimeError):
+                accrue_daily_interest(run_date=date(2026, 2, 1), annual_rate=rate, chunk_size=3)
+
+        run = AccrualRun.objects.get()
+        self.assertIsNone(run.completed_at)
+        self.assertEqual(run.processed_count, 6)
+        self.assertEqual(Transaction.objects.count(), 6)
+
+        run = accrue_daily_interest(run_date=date(2026, 2, 1), annual_rate=rate, chunk_size=3)
+
+        self.assertIsNotNone(run.completed_at)
+        self.assertEqual(Transaction.objects.count(), 10)
+        self.assertEqual(dict(Account.objects.values_list("pk", "balance")), expected)
+
+
+class AccountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("biznes@bank.uz", "biznes@bank.uz", "parol12345")
+        self.primary = self.user.accounts.get()
+        self.savings = Account.objects.create(user=self.user, name="Jamg'arma")
+        Account.objects.filter(pk=self.primary.pk).update(balance=Decimal("500.00"))
+
+    def _form(self, amount, source=None, target=None):
+        form = AccountTransferForm(
+            self.user,
+            {"from_account": (source or self.primary).pk, "to_account": (target or self.savings).pk, "amount": amount},
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form
+
+    def test_new_user_gets_primary_account(self):
+        self.assertTrue(self.primary.is_primary)
+        self.assertEqual(self.primary.number, account_number(self.primary.pk))
+        self.assertEqual(Account.objects.get(pk=self.savings.pk).number, account_number(self.savings.pk))
+        self.assertEqual(len(self.primary.number), 16)
+
+    def test_own_transfer_moves_both_balances_in_one_update(self):
+        form = self._form("120.50")
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(form.save(), Decimal("120.50"))
+
+        updates = [query for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn("EXISTS", updates[0]["sql"])
+        self.primary.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.primary.balance, Decimal("379.50"))
+        self.assertEqual(self.savings.balance, Decimal("120.50"))
+        self.assertEqual(
+            list(self.savings.ledger.values_list("transaction_type", flat=True)),
+            [Transaction.TransactionType.TRANSFER_IN],
+        )
+
+    def test_own_transfer_cannot_overdraw_after_validation(self):
+        first = self._form("300.00")
+        second = self._form("300.00")
+
+        self.assertEqual(first.save(), Decimal("300.00"))
+        self.assertIsNone(second.save())
+
+        self.assertEqual(Account.objects.get(pk=self.primary.pk).balance, Decimal("200.00"))
+        self.assertEqual(Account.objects.get(pk=self.savings.pk).balance, Decimal("300.00"))
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_own_transfer_is_noop_when_funds_vanish(self):
+        form = self._form("400.00")
+        Account.objects.filter(pk=self.primary.pk).update(balance=Decimal("100.00"))
+
+        self.assertIsNone(form.save())
+
+        self.savings.refresh_from_db()
+        self.assertEqual(self.savings.balance, Decimal("0.00"))
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_cannot_use_foreign_or_same_account(self):
+        other = User.objects.create_user("boshqa@bank.uz", "boshqa@bank.uz", "parol12345")
+        form = AccountTransferForm(
+            self.user, {"from_account": self.primary.pk, "to_account": other.accounts.get().pk, "amount": "1"}
+        )
+        self.assertIn("to_account", form.errors)
+        form = AccountTransferForm(
+            self.user, {"from_account": self.primary.pk, "to_account": self.primary.pk, "amount": "1"}
+        )
+        self.assertFalse(form.is_valid())
+
+    def test_external_transfer_from_secondary_account(self):
+        Account.objects.filter(pk=self.savings.pk).update(balance=Decimal("50.00"))
+        other = User.objects.create_user("boshqa@bank.uz", "boshqa@bank.uz", "parol12345")
+        form = TransferForm(
+            self.user, {"from_account": self.savings.pk, "recipient_email": "boshqa@bank.uz", "amount": "30"}
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        self.assertEqual(Account.objects.get(pk=self.savings.pk).balance, Decimal("20.00"))
+        self.assertEqual(Account.objects.get(pk=self.primary.pk).balance, Decimal("500.00"))
+        self.assertEqual(other.accounts.get().balance, Decimal("30.00"))
+
+    def test_external_transfer_cannot_overdraw_after_validation(self):
+        User.objects.create_user("boshqa@bank.uz", "boshqa@bank.uz", "parol12345")
+        first = TransferForm(self.user, {"recipient_email": "boshqa@bank.uz", "amount": "400"})
+        second = TransferForm(self.user, {"recipient_email": "boshqa@bank.uz", "amount": "400"})
+        self.assertTrue(first.is_valid(), first.errors)
+        self.assertTrue(second.is_valid(), second.errors)
+
+        self.assertEqual(first.save(), Decimal("400.00"))
+        self.assertIsNone(second.save())
+
+        self.assertEqual(Account.objects.get(pk=self.primary.pk).balance, Decimal("100.00"))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 1)
+
+    def test_dashboard_query_count_does_not_grow_with_accounts(self):
+        self.client.force_login(self.user)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("dashboard"))
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        baseline = count_queries()
+        for n in range(4):
+            account = Account.objects.create(user=self.user, name=f"Karta {n}")
+            for _ in range(5):
+                Transaction.objects.create(
+                    user=self.user, account=account, amount=1, transaction_type=Transaction.TransactionType.TOP_UP
+                )
+
+        self.assertEqual(count_queries(), baseline)
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(len(response.context["accounts"]), 6)
+        self.assertTrue(all(len(account.recent_ledger) <= 3 for account in response.context["accounts"]))
+
+
+class AccountMigrationTests(TransactionTestCase):
+    before = [("tizim", "0003_outbox_event")]
+    expand = [("tizim", "0004_account")]
+    contract = [("tizim", "0005_remove_userprofile_balance")]
+
+    def _migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate(target)
+        return executor.loader.project_state(target).apps
+
+    def setUp(self):
+        self.addCleanup(lambda: self._migrate(MigrationExecutor(connection).loader.graph.leaf_nodes()))
+        old_apps = self._migrate(self.before)
+        self.OldUser = old_apps.get_model("auth", "User")
+        self.OldProfile = old_apps.get_model("tizim", "UserProfile")
+        self.OldTransaction = old_apps.get_model("tizim", "Transaction")
+        for i, balance in enumerate(["10.00", "0", "123.45"]):
+            user = self.OldUser.objects.create(username=f"old{i}@bank.uz")
+            self.OldProfile.objects.create(user=user, balance=Decimal(balance))
+            self.OldTransaction.objects.create(user=user, amount=Decimal(balance), transaction_type="top_up")
+
+    def test_balances_and_ledger_move_to_primary_accounts(self):
+        new_apps = self._migrate(self.expand)
+        NewAccount = new_apps.get_model("tizim", "Account")
+        NewTransaction = new_apps.get_model("tizim", "Transaction")
+
+        self.assertEqual(
+            sorted(NewAccount.objects.filter(is_primary=True).values_list("balance", flat=True)),
+            [Decimal("0.00"), Decimal("10.00"), Decimal("123.45")],
+        )
+        self.assertFalse(NewTransaction.objects.filter(account__isnull=True).exists())
+        for pk, number in NewAccount.objects.values_list("pk", "number"):
+            self.assertEqual(number, account_number(pk))
+        for txn in NewTransaction.objects.all():
+            self.assertEqual(NewAccount.objects.get(pk=txn.account_id).user_id, txn.user_id)
+
+    def test_rollout_window_is_reconciled_before_contract(self):
+        self._migrate(self.expand)
+
+        # Eski kod hali ishlayapti: faqat UserProfile.balance ga yozadi va hisobsiz foydalanuvchi ochadi.
+        self.OldProfile.objects.filter(user__username="old0@bank.uz").update(balance=Decimal("15.00"))
+        late = self.OldUser.objects.create(username="late@bank.uz")
+        self.OldProfile.objects.create(user=late, balance=Decimal("40.00"))
+        self.OldTransaction.objects.create(user=late, amount=Decimal("40.00"), transaction_type="top_up")
+
+        # Yangi kod ham shu sxemada ishlaydi.
+        fresh = User.objects.create_user("fresh@bank.uz", "fresh@bank.uz", "parol12345")
+        self.assertIsNotNone(accrue_daily_interest(run_date=date(2026, 5, 1), annual_rate="0.05").completed_at)
+        form = TopUpForm({"amount": "5"})
+        self.assertTrue(form.is_valid())
+        form.save(User.objects.get(username="late@bank.uz"))
+
+        self._migrate(self.contract)
+
+        balances = dict(Account.objects.filter(is_primary=True).values_list("user__username", "balance"))
+        self.assertEqual(balances["old0@bank.uz"], Decimal("15.00"))
+        self.assertEqual(balances["late@bank.uz"], Decimal("45.00"))
+        self.assertEqual(balances["old2@bank.uz"], Decimal("123.45") + Decimal("0.02"))
+        self.assertEqual(balances[fresh.username], Decimal("0.00"))
+        self.assertFalse(Transaction.objects.filter(account__isnull=True).exists())
+        self.assertEqual(Account.objects.filter(number__isnull=True).count(), 0)
+
+        with connection.cursor() as cursor:
+            columns = [col.name for col in connection.introspection.get_table_description(cursor, "tizim_accrualrun")]
+        self.assertIn("last_account_id", columns)
+        self.assertNotIn("last_profile_id", columns)
+        run = accrue_daily_interest(run_date=date(2026, 5, 2), annual_rate="0.05")
+        self.assertEqual(run.last_account_id, Account.objects.order_by("pk").last().pk)
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.received.append((self.headers["X-Outbox-Event-Id"], body))
+        time.sleep(self.server.delay)
+        self.send_response(self.server.status)
+        if self.server.truncate:
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            self.wfile.write(b"{}")
+            return
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class OutboxTests(TransactionTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        self.server.received = []
+        self.server.status = 200
+        self.server.delay = 0
+        self.server.truncate = False
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.endpoint = f"http://127.0.0.1:{self.server.server_port}/hook"
+        settings_override = override_settings(
+            BANK_WEBHOOK_URLS=[self.endpoint], BANK_OUTBOX_BACKOFF_SECONDS=5, BANK_OUTBOX_MAX_ATTEMPTS=2
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.sender = User.objects.create_user("ali@bank.uz", "ali@bank.uz", "parol12345")
+        self.recipient = User.objects.create_user("vali@bank.uz", "vali@bank.uz", "parol12345")
+        Account.objects.filter(user=self.sender).update(balance=Decimal("1000.00"))
+
+    def _transfer(self, amount="250.00"):
+        self.sender.refresh_from_db()
+        form = TransferForm(self.sender, {"recipient_email": "vali@bank.uz", "amount": amount})
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def test_transfer_and_top_up_write_outbox_events(self):
+        self._transfer()
+        form = TopUpForm({"amount": "10"})
+        self.assertTrue(form.is_valid())
+        form.save(self.recipient)
+
+        events = OutboxEvent.objects.order_by("pk")
+        self.assertEqual([event.event_type for event in events], ["transfer.completed", "top_up.completed"])
+        self.assertEqual(events[0].payload["recipient"]["id"], self.recipient.pk)
+        self.assertEqual(events[0].payload["amount"], "250.00")
+        self.assertEqual(self.server.received, [])
+
+    def test_outbox_rolls_back_with_ledger(self):
+        with mock.patch.object(Transaction.objects, "create", side_effect=[mock.DEFAULT, RuntimeError("db")]):
+            with self.assertRaises(RuntimeError):
+                self._transfer()
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_dispatcher_delivers_batch(self):
+        for _ in range(3):
+            self._transfer("10")
+
+        self.assertEqual(dispatch_batch(batch_size=10, concurrency=2), 3)
+
+        self.assertEqual(len(self.server.received), 3)
+        self.assertEqual(
+            {event_id for event_id, _ in self.server.received},
+            {str(pk) for pk in OutboxEvent.objects.values_list("pk", flat=True)},
+        )
+        self.assertEqual(self.server.received[0][1]["type"], "transfer.completed")
+        self.assertFalse(OutboxEvent.objects.exclude(status=OutboxEvent.Status.DELIVERED).exists())
+        self.assertEqual(dispatch_batch(), 0)
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        self._transfer()
+        self.server.status = 503
+
+        before = timezone.now()
+        self.assertEqual(dispatch_batch(), 0)
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.status, OutboxEvent.Status.PENDING)
+        self.assertEqual(event.attempts, 1)
+        self.assertEqual(event.last_error, "HTTP 503")
+        self.assertGreaterEqual(event.next_attempt_at, before + timezone.timedelta(seconds=5))
+        self.assertEqual(dispatch_batch(), 0)
+        self.assertEqual(len(self.server.received), 1)
+
+        OutboxEvent.objects.update(next_attempt_at=timezone.now())
+        dispatch_batch()
+        event.refresh_from_db()
+        self.assertEqual(event.status, OutboxEvent.Status.FAILED)
+        self.assertEqual(event.attempts, 2)
+
+    def test_broken_events_do_not_poison_the_batch(self):
+        self._transfer("10")
+        self._transfer("20")
+        bad = OutboxEvent.objects.create(event_type="transfer.completed", endpoint="not a url", payload={})
+
+        self.assertEqual(dispatch_batch(), 2)
+
+        bad.refresh_from_db()
+        self.assertEqual(bad.attempts, 1)
+        self.assertIn("ValueError", bad.last_error)
+
+        OutboxEvent.objects.update(status=OutboxEvent.Status.PENDING, next_attempt_at=timezone.now())
+        self.server.truncate = True
+        self.assertEqual(dispatch_batch(), 0)
+        self.assertEqual(
+            OutboxEvent.objects.exclude(pk=bad.pk).filter(last_error__startswith="IncompleteRead").count(), 2
+        )
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, OutboxEvent.Status.FAILED)
+
+    def test_lease_covers_a_full_batch(self):
+        with override_settings(BANK_OUTBOX_TIMEOUT_SECONDS=5, BANK_OUTBOX_LEASE_SECONDS=60):
+            self.assertGreaterEqual(outbox._lease_seconds(100, 8), 13 * 5 * 2)
+            self.assertEqual(outbox._lease_seconds(1, 8), 60)
+
+    def test_results_are_dropped_when_lease_was_lost(self):
+        self._transfer("10")
+        self._transfer("20")
+        first, second = OutboxEvent.objects.order_by("pk")
+
+        def reclaimed_elsewhere(event):
+            # Boshqa ishchi lease tugagach hodisani olib, allaqachon yakunlagan.
+            OutboxEvent.objects.filter(pk=event.pk).update(
+                status=OutboxEvent.Status.DELIVERED if event.pk == first.pk else OutboxEvent.Status.PENDING,
+                next_attempt_at=timezone.now() + timezone.timedelta(minutes=5),
+                attempts=3,
+            )
+            return None if event.pk == first.pk else "HTTP 500"
+
+        with mock.patch.object(outbox, "_deliver", side_effect=reclaimed_elsewhere):
+            self.assertEqual(dispatch_batch(concurrency=1), 0)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, OutboxEvent.Status.DELIVERED)
+        self.assertEqual(second.status, OutboxEvent.Status.PENDING)
+        self.assertEqual(second.attempts, 3)
+        self.assertEqual(second.last_error, "")
+
+    def test_slow_consumer_does_not_block_transfer_view(self):
+        self.server.delay = 2
+        self.client.force_login(self.sender)
+
+        started = time.perf_counter()
+        response = self.client.post(reverse("transfer"), {"recipient_email": "vali@bank.uz", "amount": "5"})
+
+        self.assertRedirects(response, reverse("dashboard"), fetch_redirect_response=False)
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual(OutboxEvent.objects.get().status, OutboxEvent.Status.PENDING)
+        self.assertEqual(self.server.received, [])
+
+
+class GenerateDataTests(TestCase):
+    def test_generates_consistent_ledger(self):
+        call_command("generate_data", users=50, transactions=400, heavy_share=0.1, seed=7, stdout=io.StringIO())
+
+        self.assertEqual(User.objects.count(), 50)
+        self.assertEqual(UserProfile.objects.count(), 50)
+        self.assertEqual(Account.objects.filter(is_primary=True).count(), 50)
+        self.assertEqual(Account.objects.count(), 50 + 5 * 2)
+        for pk, number in Account.objects.values_list("pk", "number"):
+            self.assertEqual(number, account_number(pk))
+        self.assertFalse(Account.objects.filter(balance__lt=0).exists())
+        outgoing = Transaction.objects.filter(transaction_type=Transaction.TransactionType.TRANSFER_OUT)
+        incoming = Transaction.objects.filter(transaction_type=Transaction.TransactionType.TRANSFER_IN)
+        self.assertEqual(outgoing.count(), incoming.count())
+        self.assertGreater(outgoing.count(), 0)
+
+        heavy_ids = list(User.objects.order_by("pk").values_list("pk", flat=True)[:5])
+        self.assertGreater(outgoing.filter(user_id__in=heavy_ids).count(), outgoing.count() / 2)
+        for account in Account.objects.filter(is_primary=True):
+            signed = sum(
+                -txn.amount if txn.transaction_type == Transaction.TransactionType.TRANSFER_OUT else txn.amount
+                for txn in account.ledger.all()
+            )
+            self.assertEqual(account.balance, signed)
+
+        self.assertTrue(self.client.login(username="load0@load.test", password="parol12345"))
+
+    def test_continues_after_highest_existing_suffix(self):
+        call_command("generate_data", users=3, transactions=0, seed=1, stdout=io.StringIO())
+        User.objects.filter(username="load0@load.test").delete()
+        User.objects.create_user("loadtest-admin@load.test")
+
+        call_command("generate_data", users=2, transactions=0, seed=1, stdout=io.StringIO())
+
+        self.assertEqual(
+            sorted(User.objects.filter(username__regex=r"^load\d+@").values_list("username", flat=True)),
+            ["load1@load.test", "load2@load.test", "load3@load.test", "load4@load.test"],
+        )
+
+
+class LoadTestTests(TransactionTestCase):
+    def test_percentile_nearest_rank(self):
+        self.assertEqual(loadtest.percentile([5, 1, 4, 2, 3], 50), 3)
+        self.assertEqual(loadtest.percentile([5, 1, 4, 2, 3], 99), 5)
+        self.assertEqual(loadtest.percentile([], 95), 0.0)
+
+    def test_outcome_not_status_code_decides_success(self):
+        call_command("generate_data", users=2, transactions=0, seed=1, stdout=io.StringIO())
+        recorder = loadtest.Recorder()
+        client = self.client_class()
+
+        self.assertFalse(
+            recorder.request(
+                "login",
+                loadtest.redirected_to_dashboard,
+                client.post,
+                reverse("login"),
+                {"email": "load0@load.test", "password": "noto'g'ri"},
+            )
+        )
+        self.assertFalse(recorder.request("dashboard", loadtest.dashboard_rendered, client.get, reverse("dashboard")))
+        self.assertFalse(
+            recorder.request(
+                "top_up", loadtest.redirected_to_dashboard, client.post, reverse("top_up"), {"amount": "5"}
+            )
+        )
+        client.login(username="load0@load.test", password="parol12345")
+        self.assertFalse(
+            recorder.request(
+                "transfer",
+                loadtest.redirected_to_dashboard,
+                client.post,
+                reverse("transfer"),
+                {"recipient_email": "load1@load.test", "amount": "999999999"},
+            )
+        )
+
+        def locked(*args, **kwargs):
+            raise OperationalError("database is locked")
+
+        self.assertFalse(recorder.request("dashboard", loadtest.dashboard_rendered, locked))
+
+        report = loadtest.report(recorder.samples, 1.0)["endpoints"]
+        self.assertEqual(report["login"]["error_kinds"], {"unexpected_200": 1})
+        self.assertEqual(report["dashboard"]["error_kinds"], {"unexpected_200": 1, "OperationalError": 1})
+        self.assertEqual(report["top_up"]["error_kinds"], {"unexpected_302": 1})
+        self.assertEqual(report["transfer"]["errors"], 1)
+
+    def test_run_reports_every_endpoint(self):
+        call_command("generate_data", users=5, transactions=0, seed=1, stdout=io.StringIO())
+        recipients = list(User.objects.values_list("email", flat=True))
+
+        result = loadtest.run(recipients, virtual_users=2, concurrency=1, iterations=2, seed=3)
+
+        self.assertEqual(set(result["endpoints"]), set(loadtest.ENDPOINTS))
+        self.assertEqual(result["endpoints"]["register"]["requests"], 2)
+        self.assertEqual(result["endpoints"]["dashboard"]["requests"], 8)
+        for stats in result["endpoints"].values():
+            self.assertEqual(stats["errors"], 0, stats["error_kinds"])
+            self.assertGreater(stats["queries"]["mean"], 0)
+        self.assertEqual(Transaction.objects.filter(transaction_type=Transaction.TransactionType.TOP_UP).count(), 9)
+        self.assertEqual(loadtest.compare(result, result)["transfer"]["p95_ms"], 0)
+
+
+@skipUnless(os.getenv("BANK_BENCHMARK_ACCOUNTS"), "BANK_BENCHMARK_ACCOUNTS o'rnatilmagan")
+class AccrualBenchmark(TransactionTestCase):
+    def test_interest_throughput(self):
+        total = int(os.getenv("BANK_BENCHMARK_ACCOUNTS"))
+        batch = 10_000
+        for offset in range(0, total, batch):
+            users = User.objects.bulk_create(
+                [User(username=f"bench{i}@bank.uz") for i in range(offset, min(offset + batch, total))]
+            )
+            Account.objects.bulk_create(
+                [Account(user=user, balance=Decimal(i % 100_000) + Decimal("0.37")) for i, user in enumerate(users)]
+            )
+
+        started = time.perf_counter()
+        run = accrue_daily_interest(run_date=date(2026, 3, 1), annual_rate="0.05")
+        elapsed = time.perf_counter() - started
+
+        print(f"\n{run.processed_count} hisob: {elapsed:.2f} s ({run.processed_count / elapsed:.0f} hisob/s)")
+        self.assertEqual(run.processed_count, total)
@@ -9,6 +9,8 @@ urlpatterns = [
     path("logout/", views.logout_view, name="logout"),
     path("transfer/", views.transfer_view, name="transfer"),
     path("top-up/", views.top_up_view, name="top_up"),
+    path("accounts/new/", views.account_create_view, name="account_create"),
+    path("accounts/transfer/", views.account_transfer_view, name="account_transfer"),
     path("profile/", views.profile_view, name="profile"),
     path("docs/", views.docs_view, name="docs"),
 ]
@@ -2,11 +2,21 @@ from django.contrib import messages
 from django.contrib.auth import login, logout, update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import PasswordChangeForm
+from django.db.models import Prefetch, Sum
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from rest_framework import viewsets
 
-from .forms import LoginForm, ProfileForm, RegistrationForm, TopUpForm, TransferForm
+from .forms import (
+    AccountForm,
+    AccountTransferForm,
+    LoginForm,
+    ProfileForm,
+    RegistrationForm,
+    TopUpForm,
+    TransferForm,
+)
+from .models import Transaction
 
 
 def register_view(request):
@@ -79,10 +89,19 @@ def dashboard_view(request):
         ]
         return render(request, "home.html", {"sections": sections})
 
+    # Hisoblar soni qancha bo'lishidan qat'i nazar so'rovlar soni o'zgarmaydi:
+    # har bir hisobning oxirgi yozuvlari bitta oynali (window) so'rov bilan olinadi.
     profile = request.user.profile
-    recent_transactions = request.user.transactions.all()[:5]
+    accounts = list(
+        request.user.accounts.prefetch_related(
+            Prefetch("ledger", queryset=Transaction.objects.order_by("-created_at")[:3], to_attr="recent_ledger")
+        )
+    )
+    recent_transactions = request.user.transactions.select_related("account")[:5]
     context = {
         "profile": profile,
+        "accounts": accounts,
+        "total_balance": sum(account.balance for account in accounts),
         "recent_transactions": recent_transactions,
     }
     return render(request, "dashboard.html", context)
@@ -93,9 +112,10 @@ def transfer_view(request):
     if request.method == "POST":
         form = TransferForm(request.user, request.POST)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Pul muvaffaqiyatli o'tkazildi.")
-            return redirect("dashboard")
+            if form.save() is not None:
+                messages.success(request, "Pul muvaffaqiyatli o'tkazildi.")
+                return redirect("dashboard")
+            form.add_error(None, "Balansda yetarli mablag' yo'q.")
     else:
         form = TransferForm(request.user)
     return render(request, "transactions/transfer.html", {"form": form})
@@ -106,7 +126,7 @@ def top_up_view(request):
     wants_fake = request.GET.get("fake") == "1" or request.POST.get("fake") == "1"
     is_fake = request.user.is_staff and wants_fake
     if request.method == "POST":
-        form = TopUpForm(request.POST)
+        form = TopUpForm(request.POST, user=request.user)
         if form.is_valid():
             form.save(request.user, is_fake=is_fake, performed_by=request.user)
             msg = "Fake to'lov qo'shildi." if is_fake else "Balans to'ldirildi."
@@ -114,10 +134,37 @@ def top_up_view(request):
             messages.success(request, msg)
             return redirect("dashboard")
     else:
-        form = TopUpForm()
+        form = TopUpForm(user=request.user)
     return render(request, "transactions/top_up.html", {"form": form})
 
 
+@login_required
+def account_create_view(request):
+    if request.method == "POST":
+        form = AccountForm(request.POST)
+        if form.is_valid():
+            form.save(request.user)
+            messages.success(request, "Yangi hisob ochildi.")
+            return redirect("dashboard")
+    else:
+        form = AccountForm()
+    return render(request, "accounts/create.html", {"form": form})
+
+
+@login_required
+def account_transfer_view(request):
+    if request.method == "POST":
+        form = AccountTransferForm(request.user, request.POST)
+        if form.is_valid():
+            if form.save() is not None:
+                messages.success(request, "Hisoblar orasida o'tkazma bajarildi.")
+                return redirect("dashboard")
+            form.add_error(None, "Balansda yetarli mablag' yo'q.")
+    else:
+        form = AccountTransferForm(request.user)
+    return render(request, "accounts/transfer.html", {"form": form})
+
+
 @login_required
 def profile_view(request):
     profile = request.user.profile
@@ -144,6 +191,7 @@ def profile_view(request):
     context = {
         "profile_form": profile_form,
         "password_form": password_form,
+        "total_balance": request.user.accounts.aggregate(total=Sum("balance"))["total"] or 0,
         "transactions": request.user.transactions.all()[:5],
     }
     return render(request, "profile.html", context)
@@ -173,6 +221,7 @@ def docs_view(request):
                 "Email orqali foydalanuvchilar orasida o'tkazma",
                 "Balans yetarliligini tekshirish va ikki tomonlama yozuv",
                 "Adminlar uchun fake to'lov rejimi",
+                "Bir nechta hisob/karta va ular orasida tezkor o'tkazma",
             ],
         },
         {